@@ -1,18 +1,32 @@
-from dotenv import load_dotenv
+import time
+_START_TIME = time.perf_counter()
+
+import argparse
 import os
-import psycopg2
 import random
+import sys
 from datetime import datetime, timedelta
-from faker import Faker
-import pandas as pd
 from pathlib import Path
 import traceback
 
-# Load .env variables
-env_path = Path(__file__).parent / 'rdsAuthenticator.env'
-load_dotenv(env_path)
+# Heavy dependencies (psycopg2, Faker, pandas, python-dotenv) are imported
+# lazily by the functions that need them so that light subcommands such as
+# `fk-drop` or `check-connection` start up quickly.
+
+ENV_PATH = Path(__file__).parent / 'rdsAuthenticator.env'
+_env_loaded = False
+
+def load_env():
+    """Load .env variables once, on first use"""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv(ENV_PATH)
+        _env_loaded = True
 
 def get_connection():
+    import psycopg2
+    load_env()
     return psycopg2.connect(
         host=os.getenv("DB_HOST"),
         database=os.getenv("DB_NAME"),
@@ -21,10 +35,18 @@ def get_connection():
         port=os.getenv("DB_PORT")
     )
 
-fake = Faker()
-# Comment out seeds for different data each run
-# Faker.seed(42)
-# random.seed(42)
+fake = None
+
+def get_faker():
+    """Create the shared Faker instance on first use"""
+    global fake
+    if fake is None:
+        from faker import Faker
+        fake = Faker()
+        # Comment out seeds for different data each run
+        # Faker.seed(42)
+        # random.seed(42)
+    return fake
 
 # Configuration
 NUM_CUSTOMERS = 50
@@ -37,8 +59,8 @@ NUM_PAYMENTS = 200
 NUM_RETURNS = 26
 NUM_PRICE_HISTORY = 60
 
-# Generate batch ID once
-BATCH_ID = datetime.now().strftime('%Y%m%d_%H%M%S')
+def new_batch_id():
+    return datetime.now().strftime('%Y%m%d_%H%M%S')
 
 def random_date(start_year=2025, end_year=2025):
     start = datetime(start_year, 1, 1)
@@ -49,6 +71,7 @@ def random_dob():
     return random_date(1960, 2005).strftime('%Y-%m-%d')
 
 def generate_customers(n):
+    fake = get_faker()
     customers = []
     for i in range(1, n + 1):
         customers.append({
@@ -63,6 +86,7 @@ def generate_customers(n):
     return customers
 
 def generate_employees(n):
+    fake = get_faker()
     employees = []
     for i in range(1, n + 1):
         employees.append({
@@ -80,6 +104,7 @@ def generate_employees(n):
     return employees
 
 def generate_departments(n, employees):
+    fake = get_faker()
     departments = []
     for i in range(1, n + 1):
         departments.append({
@@ -97,6 +122,7 @@ def generate_departments(n, employees):
     return departments
 
 def generate_manufactures(n):
+    fake = get_faker()
     manufactures = []
     for i in range(1, n + 1):
         manufactures.append({
@@ -110,6 +136,7 @@ def generate_manufactures(n):
     return manufactures
 
 def generate_products(n, manufactures):
+    fake = get_faker()
     products = []
     for i in range(1, n + 1):
         products.append({
@@ -244,9 +271,10 @@ def generate_price_history(n, products, employees):
     
     return price_history
 
-# Add tracking columns (run ONCE, then comment out)
+# Add tracking columns (run ONCE via the `add-tracking` subcommand)
 def add_tracking_columns():
-    """Run this function ONCE to add batch_id and time_updated columns"""
+    """Run this function ONCE to add batch_id and time_updated columns.
+    Returns True if every table was altered"""
     conn = get_connection()
     cursor = conn.cursor()
     
@@ -258,6 +286,7 @@ def add_tracking_columns():
     print("ADDING TRACKING COLUMNS")
     print("="*60)
     
+    failed_count = 0
     for table in tables:
         try:
             cursor.execute(f"""
@@ -270,13 +299,16 @@ def add_tracking_columns():
         except Exception as e:
             conn.rollback()
             print(f"✗ Error on {table}: {e}")
+            failed_count += 1
     
     cursor.close()
     conn.close()
     print("="*60)
+    return failed_count == 0
 
 # Drop ALL foreign key constraints ONCE
 def drop_all_foreign_keys():
+    """Returns True if every foreign key constraint was dropped"""
     conn = get_connection()
     cursor = conn.cursor()
     
@@ -300,28 +332,33 @@ def drop_all_foreign_keys():
         if not constraints:
             print("No foreign key constraints found")
         
+        failed_count = 0
         for table_name, constraint_name in constraints:
             try:
                 cursor.execute(f'ALTER TABLE "{table_name}" DROP CONSTRAINT IF EXISTS "{constraint_name}"')
                 print(f" Dropped {constraint_name} from {table_name}")
             except Exception as e:
                 print(f"✗ Failed to drop {constraint_name}: {e}")
+                failed_count += 1
         
         conn.commit()
         print("="*60)
-        print(f"✓ Dropped {len(constraints)} constraints")
+        print(f"✓ Dropped {len(constraints) - failed_count}/{len(constraints)} constraints")
         print("="*60)
+        return failed_count == 0
         
     except Exception as e:
         conn.rollback()
         print(f"Error dropping constraints: {e}")
         traceback.print_exc()
+        return False
     finally:
         cursor.close()
         conn.close()
 
 # Re-create ALL foreign key constraints ONCE
 def recreate_all_foreign_keys():
+    """Returns True if every foreign key constraint was re-created"""
     conn = get_connection()
     cursor = conn.cursor()
     
@@ -395,11 +432,13 @@ def recreate_all_foreign_keys():
         print("="*60)
         print(f"✓ Re-created {success_count}/{len(constraints)} constraints")
         print("="*60)
+        return success_count == len(constraints)
         
     except Exception as e:
         conn.rollback()
         print(f"Error adding constraints: {e}")
         traceback.print_exc()
+        return False
     finally:
         cursor.close()
         conn.close()
@@ -495,8 +534,11 @@ def generate_sql_inserts(table_name, data):
             val = row[col]
             if val is None:
                 values.append('NULL')
+            elif isinstance(val, datetime):
+                values.append(f"'{val}'")
             elif isinstance(val, str):
-                values.append(f"'{val.replace('\'', '\'\'')}'")
+                escaped = val.replace("'", "''")
+                values.append(f"'{escaped}'")
             else:
                 values.append(str(val))
         
@@ -505,18 +547,43 @@ def generate_sql_inserts(table_name, data):
     sql += "\n"
     return sql
 
-# Main execution
-if __name__ == "__main__":
+# Load order respects dependencies: tables without dependencies first,
+# then tables that depend on them, then orders and related
+TABLE_ORDER = ['customer', 'manufacture', 'employee', 'department', 'product',
+               'orders', 'order_details', 'shipping', 'payment',
+               'return_request', 'price_history']
+
+# Order tables are written to the SQL backup file
+BACKUP_ORDER = ['customer', 'employee', 'department', 'manufacture', 'product',
+                'orders', 'order_details', 'shipping', 'payment',
+                'return_request', 'price_history']
+
+CSV_FILE_NAMES = {
+    'customer': 'customers',
+    'employee': 'employees',
+    'department': 'departments',
+    'manufacture': 'manufactures',
+    'product': 'products',
+    'orders': 'orders',
+    'order_details': 'order_details',
+    'shipping': 'shipping',
+    'payment': 'payments',
+    'return_request': 'returns',
+    'price_history': 'price_history'
+}
+
+def startup_time():
+    """Seconds elapsed between module import and now"""
+    return time.perf_counter() - _START_TIME
+
+def print_banner(title):
     print("\n" + "="*60)
-    print("ETL PROCESS STARTING")
-    print(f"Batch ID: {BATCH_ID}")
+    print(title)
     print("="*60)
-    
-    # STEP 0: Add tracking columns (UNCOMMENT AND RUN ONCE, then comment out)
-    # add_tracking_columns()
-    
-    # STEP 1: Generate data
-    print("\nSTEP 1: GENERATING DATA")
+
+def generate_all_data():
+    """Generate every table and return them keyed by table name"""
+    print("\nGENERATING DATA")
     print("-"*60)
     
     customers = generate_customers(NUM_CUSTOMERS)
@@ -533,107 +600,221 @@ if __name__ == "__main__":
     
     print("Data generation complete")
     
-    # STEP 2: Drop ALL constraints ONCE
+    return {
+        'customer': customers,
+        'employee': employees,
+        'department': departments,
+        'manufacture': manufactures,
+        'product': products,
+        'orders': orders,
+        'order_details': order_details,
+        'shipping': shipping,
+        'payment': payments,
+        'return_request': returns,
+        'price_history': price_history
+    }
+
+def tag_batch(all_data, batch_id):
+    """Add batch_id and time_updated to every row so loads and exports share one schema"""
+    timestamp = datetime.now()
+    for data in all_data.values():
+        for row in data:
+            row['batch_id'] = batch_id
+            row['time_updated'] = timestamp
+    return all_data
+
+def prepare_batch(batch_id):
+    """Generate every table and tag the rows with the batch ID"""
+    return tag_batch(generate_all_data(), batch_id)
+
+def load_all_data(all_data, batch_id):
+    """Drop FKs, insert every table in dependency order, then restore FKs"""
+    # Drop ALL constraints ONCE
     drop_all_foreign_keys()
     
-    # STEP 3: Insert data in dependency order
-    print("\nSTEP 3: INSERTING DATA INTO RDS")
+    print("\nINSERTING DATA INTO RDS")
     print("-"*60)
     
-    # Tables without dependencies first
-    insert_data_into_rds('customer', customers, BATCH_ID)
-    insert_data_into_rds('manufacture', manufactures, BATCH_ID)
+    for table_name in TABLE_ORDER:
+        insert_data_into_rds(table_name, all_data[table_name], batch_id)
     
-    # Then tables that depend on above
-    insert_data_into_rds('employee', employees, BATCH_ID)
-    insert_data_into_rds('department', departments, BATCH_ID)
-    insert_data_into_rds('product', products, BATCH_ID)
-    
-    # Then orders and related
-    insert_data_into_rds('orders', orders, BATCH_ID)
-    insert_data_into_rds('order_details', order_details, BATCH_ID)
-    insert_data_into_rds('shipping', shipping, BATCH_ID)
-    insert_data_into_rds('payment', payments, BATCH_ID)
-    insert_data_into_rds('return_request', returns, BATCH_ID)
-    insert_data_into_rds('price_history', price_history, BATCH_ID)
-    
-    # STEP 4: Re-add ALL constraints ONCE
+    # Re-add ALL constraints ONCE
     recreate_all_foreign_keys()
-    
-    # STEP 5: Generate SQL backup file
-    print("\nSTEP 5: GENERATING SQL BACKUP FILE")
+
+def write_sql_backup(all_data, batch_id, path='database_inserts.sql'):
+    print("\nGENERATING SQL BACKUP FILE")
     print("-"*60)
     
     try:
-        with open('database_inserts.sql', 'w', encoding='utf-8') as f:
+        with open(path, 'w', encoding='utf-8') as f:
             f.write(f"-- Generated Database Insert Statements\n")
-            f.write(f"-- Batch ID: {BATCH_ID}\n")
+            f.write(f"-- Batch ID: {batch_id}\n")
             f.write(f"-- Generated: {datetime.now()}\n\n")
-            f.write(generate_sql_inserts('customer', customers))
-            f.write(generate_sql_inserts('employee', employees))
-            f.write(generate_sql_inserts('department', departments))
-            f.write(generate_sql_inserts('manufacture', manufactures))
-            f.write(generate_sql_inserts('product', products))
-            f.write(generate_sql_inserts('orders', orders))
-            f.write(generate_sql_inserts('order_details', order_details))
-            f.write(generate_sql_inserts('shipping', shipping))
-            f.write(generate_sql_inserts('payment', payments))
-            f.write(generate_sql_inserts('return_request', returns))
-            f.write(generate_sql_inserts('price_history', price_history))
-        print(" database_inserts.sql created")
+            for table_name in BACKUP_ORDER:
+                f.write(generate_sql_inserts(table_name, all_data[table_name]))
+        print(f" {path} created")
     except Exception as e:
         print(f"Error generating SQL file: {e}")
-    
-    # STEP 6: Generate CSV files
-    print("\nSTEP 6: GENERATING CSV FILES")
+
+def write_csv_exports(all_data, folder='csv_exports'):
+    print("\nGENERATING CSV FILES")
     print("-"*60)
     
     try:
+        import pandas as pd
+        
         # Create csv_exports folder if it doesn't exist
-        csv_folder = Path('csv_exports')
+        csv_folder = Path(folder)
         csv_folder.mkdir(exist_ok=True)
         
-        all_data = {
-            'customers': customers,
-            'employees': employees,
-            'departments': departments,
-            'manufactures': manufactures,
-            'products': products,
-            'orders': orders,
-            'order_details': order_details,
-            'shipping': shipping,
-            'payments': payments,
-            'returns': returns,
-            'price_history': price_history
-        }
-        
-        for table_name, data in all_data.items():
+        for table_name in BACKUP_ORDER:
+            data = all_data[table_name]
             if data:
+                file_name = CSV_FILE_NAMES[table_name]
                 df = pd.DataFrame(data)
-                file_path = csv_folder / f"{table_name}.csv"
+                file_path = csv_folder / f"{file_name}.csv"
                 df.to_csv(file_path, index=False, encoding='utf-8')
-                print(f" {table_name}.csv created ({len(data)} records)")
+                print(f" {file_name}.csv created ({len(data)} records)")
         
         print(f" All CSV files saved to {csv_folder}/")
     except Exception as e:
         print(f" Error generating CSV files: {e}")
         traceback.print_exc()
-    
-    # Summary
-    print("\n" + "="*60)
-    print("ETL PROCESS COMPLETE!")
-    print("="*60)
-    print(f"Batch ID: {BATCH_ID}")
+
+def print_summary(title, all_data, batch_id, started):
+    print_banner(title)
+    print(f"Batch ID: {batch_id}")
     print(f"\nData Summary:")
-    print(f"  • {len(customers):3d} customers")
-    print(f"  • {len(employees):3d} employees")
-    print(f"  • {len(departments):3d} departments")
-    print(f"  • {len(manufactures):3d} manufactures")
-    print(f"  • {len(products):3d} products")
-    print(f"  • {len(orders):3d} orders")
-    print(f"  • {len(order_details):3d} order details")
-    print(f"  • {len(shipping):3d} shipping records")
-    print(f"  • {len(payments):3d} payments")
-    print(f"  • {len(returns):3d} return requests")
-    print(f"  • {len(price_history):3d} price history records")
+    print(f"  • {len(all_data['customer']):3d} customers")
+    print(f"  • {len(all_data['employee']):3d} employees")
+    print(f"  • {len(all_data['department']):3d} departments")
+    print(f"  • {len(all_data['manufacture']):3d} manufactures")
+    print(f"  • {len(all_data['product']):3d} products")
+    print(f"  • {len(all_data['orders']):3d} orders")
+    print(f"  • {len(all_data['order_details']):3d} order details")
+    print(f"  • {len(all_data['shipping']):3d} shipping records")
+    print(f"  • {len(all_data['payment']):3d} payments")
+    print(f"  • {len(all_data['return_request']):3d} return requests")
+    print(f"  • {len(all_data['price_history']):3d} price history records")
+    print(f"\nTiming:")
+    print(f"  • Startup: {started:.3f}s")
+    print(f"  • Total:   {startup_time():.3f}s")
     print("="*60)
+
+def check_connection():
+    """Open a connection and run a trivial query; return True on success"""
+    try:
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT current_date;")
+        print("Connected! Today:", cursor.fetchone()[0])
+        cursor.close()
+        conn.close()
+        return True
+    except Exception as e:
+        print("Database connection failed:", e)
+        return False
+
+# Subcommand handlers
+def cmd_generate(args, started):
+    all_data = generate_all_data()
+    print_summary("DATA GENERATION COMPLETE!", all_data, args.batch_id, started)
+    return 0
+
+def cmd_load(args, started):
+    all_data = prepare_batch(args.batch_id)
+    load_all_data(all_data, args.batch_id)
+    if not args.no_export:
+        write_sql_backup(all_data, args.batch_id, args.sql_file)
+        write_csv_exports(all_data, args.csv_dir)
+    print_summary("ETL PROCESS COMPLETE!", all_data, args.batch_id, started)
+    return 0
+
+def cmd_export(args, started):
+    all_data = prepare_batch(args.batch_id)
+    write_sql_backup(all_data, args.batch_id, args.sql_file)
+    write_csv_exports(all_data, args.csv_dir)
+    print_summary("EXPORT COMPLETE!", all_data, args.batch_id, started)
+    return 0
+
+def cmd_fk_drop(args, started):
+    return 0 if drop_all_foreign_keys() else 1
+
+def cmd_fk_restore(args, started):
+    return 0 if recreate_all_foreign_keys() else 1
+
+def cmd_add_tracking(args, started):
+    return 0 if add_tracking_columns() else 1
+
+def cmd_check_connection(args, started):
+    return 0 if check_connection() else 1
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Generate fake e-commerce data and load it into RDS PostgreSQL"
+    )
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND')
+    
+    def add_batch_id(sub):
+        sub.add_argument('--batch-id', default=None,
+                         help="Batch ID to tag rows with (default: current timestamp)")
+    
+    def add_export_paths(sub):
+        sub.add_argument('--sql-file', default='database_inserts.sql',
+                         help="SQL backup file to write (default: %(default)s)")
+        sub.add_argument('--csv-dir', default='csv_exports',
+                         help="Folder for CSV exports (default: %(default)s)")
+    
+    sub = subparsers.add_parser('generate', help="Generate data and print a summary (no database)")
+    add_batch_id(sub)
+    sub.set_defaults(func=cmd_generate)
+    
+    sub = subparsers.add_parser('load', help="Generate data, load it into RDS and write backup files (full ETL)")
+    add_batch_id(sub)
+    add_export_paths(sub)
+    sub.add_argument('--no-export', action='store_true',
+                     help="Skip writing the SQL backup and CSV files")
+    sub.set_defaults(func=cmd_load)
+    
+    sub = subparsers.add_parser('export', help="Generate data and write the SQL backup and CSV files (no database)")
+    add_batch_id(sub)
+    add_export_paths(sub)
+    sub.set_defaults(func=cmd_export)
+    
+    sub = subparsers.add_parser('fk-drop', help="Drop all foreign key constraints")
+    sub.set_defaults(func=cmd_fk_drop)
+    
+    sub = subparsers.add_parser('fk-restore', help="Re-create all foreign key constraints")
+    sub.set_defaults(func=cmd_fk_restore)
+    
+    sub = subparsers.add_parser('add-tracking', help="Add batch_id and time_updated columns (run once)")
+    sub.set_defaults(func=cmd_add_tracking)
+    
+    sub = subparsers.add_parser('check-connection', help="Test the database connection")
+    sub.set_defaults(func=cmd_check_connection)
+    
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    # No subcommand: run the full ETL, as before
+    if args.command is None:
+        args = parser.parse_args(['load'])
+    
+    if getattr(args, 'batch_id', None) is None:
+        args.batch_id = new_batch_id()
+    
+    started = startup_time()
+    print_banner(f"ETL: {args.command.upper()}")
+    if args.command in ('generate', 'load', 'export'):
+        print(f"Batch ID: {args.batch_id}")
+    print(f"Startup time: {started:.3f}s")
+    print("="*60)
+    
+    return args.func(args, started)
+
+# Main execution
+if __name__ == "__main__":
+    sys.exit(main())